@@ -0,0 +1,523 @@
+import json
+import boto3
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
+import os
+import logging
+from time import gmtime, time_ns
+from decimal import Decimal
+import base64
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # orjson ships in an optional Lambda layer
+    orjson = None
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+# Keep-alive connection pool so warm invocations reuse the TCP/TLS session
+boto_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={'max_attempts': 3, 'mode': 'standard'}
+)
+dynamodb = boto3.client('dynamodb', config=boto_config)
+user_data_table = os.environ['USER_DATA_TABLE']
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+# Runs independent DynamoDB calls side by side; boto3 clients are thread-safe
+executor = ThreadPoolExecutor(max_workers=2)
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+MAX_PAYLOAD_SIZE_MB = 10
+
+# List responses at least this large are gzipped for clients that accept it
+GZIP_MIN_SIZE_BYTES = 1024
+GZIP_COMPRESS_LEVEL = 5
+
+# Single-settlement reads are memoized per warm container for this long
+SETTLEMENT_CACHE_TTL_SECONDS = 30
+SETTLEMENT_CACHE_SIZE = 256
+
+# (user_id, settlement_id) -> (ttl_bucket, encoded body); only found items
+# are stored so a settlement created elsewhere is never reported missing
+settlement_cache = {}
+
+# Attributes returned by list queries when ?summary=true skips the data blob
+SUMMARY_PROJECTION = 'settlement_id, updated_at'
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,POST,DELETE,OPTIONS'
+}
+
+def build_response(status_code, body):
+    """Wrap a JSON body in an API Gateway proxy response with the shared CORS headers"""
+    return {'statusCode': status_code, 'headers': CORS_HEADERS, 'body': body}
+
+def accepts_gzip(event):
+    """Check the Accept-Encoding request header, whose name case varies by client"""
+    headers = event.get('headers') or {}
+    return any(
+        name.lower() == 'accept-encoding' and 'gzip' in (value or '')
+        for name, value in headers.items()
+    )
+
+def build_compressed_response(event, body):
+    """
+    Build a 200 response from UTF-8 JSON bytes, gzipping large bodies when
+    the client accepts it
+    The bytes go straight to gzip and are only decoded for uncompressed
+    responses. API Gateway decodes the base64 body back to binary because
+    the API registers */* as a binary media type.
+    """
+    if len(body) < GZIP_MIN_SIZE_BYTES or not accepts_gzip(event):
+        return build_response(200, body.decode())
+
+    compressed = gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL)
+    return {
+        'statusCode': 200,
+        'headers': {**CORS_HEADERS, 'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'},
+        'isBase64Encoded': True,
+        'body': base64.b64encode(compressed).decode()
+    }
+
+def undecimal(o):
+    """
+    Replace the Decimal values returned by DynamoDB with int or float
+    One pass up front lets the encoders below run without a per-value
+    Python default() callback.
+    """
+    if isinstance(o, dict):
+        return {key: undecimal(value) for key, value in o.items()}
+    if isinstance(o, list):
+        return [undecimal(value) for value in o]
+    if isinstance(o, Decimal):
+        return float(o) if o % 1 else int(o)
+    return o
+
+def encode_json_bytes(obj):
+    """Serialize to UTF-8 JSON, using orjson when it is available"""
+    if orjson is not None:
+        return orjson.dumps(undecimal(obj))
+    return json.dumps(undecimal(obj)).encode()
+
+def encode_json(obj):
+    """Serialize a response body, using orjson when it is available"""
+    if orjson is not None:
+        return orjson.dumps(undecimal(obj)).decode()
+    return json.dumps(undecimal(obj))
+
+def deserialize_item(item):
+    """Convert a low-level DynamoDB item into plain Python values"""
+    return {key: deserializer.deserialize(value) for key, value in item.items()}
+
+def settlement_key(user_id, settlement_id):
+    """Build the low-level primary key for a settlement"""
+    return {
+        'user_id': {'S': user_id},
+        'settlement_id': {'S': settlement_id}
+    }
+
+def settlement_query_params(user_id, summary):
+    """Build the query parameters for listing a user's settlements"""
+    params = {
+        'TableName': user_data_table,
+        'KeyConditionExpression': 'user_id = :user_id',
+        'ExpressionAttributeValues': {
+            ':user_id': {'S': user_id}
+        }
+    }
+    if summary:
+        params['ProjectionExpression'] = SUMMARY_PROJECTION
+    return params
+
+def encode_all_settlements(user_id, summary=False):
+    """
+    Encode every settlement for a user as a JSON array
+    Walks all query pages and appends each item to the output buffer as it
+    arrives, so neither the full item list nor a second copy of the JSON is
+    held in memory.
+    Returns: (UTF-8 JSON bytes, item count)
+    """
+    paginator = dynamodb.get_paginator('query')
+    pages = paginator.paginate(**settlement_query_params(user_id, summary))
+
+    buffer = bytearray(b'[')
+    count = 0
+    for page in pages:
+        for item in page.get('Items', []):
+            if count:
+                buffer += b','
+            buffer += encode_json_bytes(deserialize_item(item))
+            count += 1
+    buffer += b']'
+    return buffer, count
+
+def encode_cursor(last_key):
+    """Encode a LastEvaluatedKey as an opaque pagination cursor"""
+    # Only the sort key goes into the cursor; the partition key always comes
+    # from the caller's token so a cursor can't start another user's query
+    settlement_id = last_key['settlement_id']['S']
+    return base64.urlsafe_b64encode(settlement_id.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, user_id):
+    """Rebuild the ExclusiveStartKey for a cursor returned by encode_cursor"""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    settlement_id = base64.urlsafe_b64decode(padded.encode()).decode()
+    if not settlement_id:
+        raise ValueError('Empty cursor')
+    return settlement_key(user_id, settlement_id)
+
+def fetch_settlement_page(user_id, limit, start_key, summary=False):
+    """
+    Fetch one bounded page of settlements for a user
+    Returns: (items, cursor for the next page or None)
+    """
+    params = settlement_query_params(user_id, summary)
+    params['Limit'] = limit
+    if start_key:
+        params['ExclusiveStartKey'] = start_key
+
+    response = dynamodb.query(**params)
+    items = [deserialize_item(item) for item in response.get('Items', [])]
+    last_key = response.get('LastEvaluatedKey')
+    return items, encode_cursor(last_key) if last_key else None
+
+def utc_timestamp():
+    """Current UTC time in datetime.isoformat() layout, without building a datetime"""
+    seconds, nanos = divmod(time_ns(), 1_000_000_000)
+    t = gmtime(seconds)
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+        f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{nanos // 1000:06d}"
+    )
+
+def extract_user_id(event):
+    """Extract user ID from JWT token in Authorization header"""
+    # Try to get from API Gateway authorizer context first (if using authorizer)
+    claims = event.get('requestContext', {}).get('authorizer', {}).get('claims', {})
+    user_id = claims.get('sub')
+
+    if user_id:
+        return user_id
+
+    # Otherwise, extract from JWT token directly
+    auth_header = event.get('headers', {}).get('Authorization', '')
+    if not auth_header.startswith('Bearer '):
+        raise ValueError('Missing or invalid Authorization header')
+
+    token = auth_header[7:]  # Remove 'Bearer ' prefix
+
+    try:
+        # Decode JWT (without verification for now - API Gateway handles verification)
+        # JWT format: header.payload.signature
+        if token.count('.') != 2:
+            raise ValueError('Invalid JWT format')
+
+        # Slice out the payload and add its base64 padding in one step
+        payload = token[token.index('.') + 1:token.rindex('.')]
+        decoded = base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4))
+        claims = json_loads(decoded)
+        user_id = claims.get('sub')
+
+        if not user_id:
+            raise ValueError('User ID not found in token')
+
+        logger.debug("Extracted user_id from token: %s", user_id)
+        return user_id
+
+    except Exception as e:
+        logger.error("Failed to extract user ID from token: %s", e)
+        raise ValueError(f'Invalid token: {e}')
+
+
+def fetch_settlement_body(user_id, settlement_id, ttl_bucket):
+    """
+    Read one settlement and encode it as a response body
+    Found items are memoized per warm container until ttl_bucket advances
+    (every SETTLEMENT_CACHE_TTL_SECONDS), and saves and deletes in this
+    container evict them. Writes handled by other containers can take up
+    to the TTL to show up here.
+    Returns: JSON string, or None if the settlement does not exist
+    """
+    key = (user_id, settlement_id)
+    cached = settlement_cache.get(key)
+    if cached is not None and cached[0] == ttl_bucket:
+        return cached[1]
+
+    response = dynamodb.get_item(
+        TableName=user_data_table,
+        Key=settlement_key(user_id, settlement_id)
+    )
+
+    item = response.get('Item')
+    if not item:
+        settlement_cache.pop(key, None)
+        return None
+
+    body = encode_json(deserialize_item(item))
+    settlement_cache.pop(key, None)
+    if len(settlement_cache) >= SETTLEMENT_CACHE_SIZE:
+        # Dicts keep insertion order, so the first key is the oldest entry
+        del settlement_cache[next(iter(settlement_cache))]
+    settlement_cache[key] = (ttl_bucket, body)
+    return body
+
+def get_settlement(event, user_id, settlement_id):
+    """
+    GET /user-data/{settlement_id}
+    Optional: include=summaries also lists the user's settlements (settlement_id
+              and updated_at), queried concurrently with the item read
+    Returns: The stored settlement item, or 404; with include=summaries
+             {"item": {...}, "settlements": [...]}
+    """
+    query_parameters = event.get('queryStringParameters') or {}
+    ttl_bucket = time_ns() // (SETTLEMENT_CACHE_TTL_SECONDS * 1_000_000_000)
+
+    summaries = None
+    if query_parameters.get('include') == 'summaries':
+        # Start the list query first so it overlaps with the item read below
+        summaries = executor.submit(encode_all_settlements, user_id, True)
+
+    try:
+        body = fetch_settlement_body(user_id, settlement_id, ttl_bucket)
+    finally:
+        # Never leave the query running once the handler returns; Lambda
+        # freezes the container and the work would resume mid-request later
+        summaries_result = summaries.result() if summaries is not None else None
+
+    if body is None:
+        logger.warning("Settlement not found | user_id=%s | settlement_id=%s", user_id, settlement_id)
+        return build_response(404, json.dumps({'error': 'Settlement not found'}))
+
+    if summaries_result is not None:
+        # Both parts are already encoded JSON, so splice them without re-encoding
+        summaries_body, count = summaries_result
+        logger.debug("Retrieved settlement with %d summaries | user_id=%s", count, user_id)
+        body = f'{{"item":{body},"settlements":{summaries_body.decode()}}}'
+
+    return build_response(200, body)
+
+def list_settlements(event, user_id, settlement_id):
+    """
+    GET /user-data
+    Optional: limit and cursor query parameters page through all settlements;
+              summary=true lists settlement_id and updated_at without data
+    Returns: All settlements for user, or when paging
+             {"items": [...], "next": cursor or null}; gzipped when the
+             client sends Accept-Encoding: gzip
+    """
+    query_parameters = event.get('queryStringParameters') or {}
+    summary = query_parameters.get('summary') in ('true', '1')
+
+    if 'limit' in query_parameters or 'cursor' in query_parameters:
+        # Get one page of settlements for user
+        try:
+            limit = int(query_parameters.get('limit') or DEFAULT_PAGE_SIZE)
+            cursor = query_parameters.get('cursor')
+            start_key = decode_cursor(cursor, user_id) if cursor else None
+            valid_params = 1 <= limit <= MAX_PAGE_SIZE
+        except ValueError:
+            valid_params = False
+
+        if not valid_params:
+            logger.warning("Invalid pagination parameters | user_id=%s | params=%s", user_id, query_parameters)
+            return build_response(400, json.dumps({'error': f'limit must be between 1 and {MAX_PAGE_SIZE} and cursor must come from a previous response'}))
+
+        items, next_cursor = fetch_settlement_page(user_id, limit, start_key, summary)
+        logger.debug("Retrieved page of %d settlements | user_id=%s", len(items), user_id)
+        return build_compressed_response(event, encode_json_bytes({'items': items, 'next': next_cursor}))
+
+    # Get all settlements for user
+    body, count = encode_all_settlements(user_id, summary)
+    logger.debug("Retrieved %d settlements | user_id=%s", count, user_id)
+    return build_compressed_response(event, body)
+
+def save_settlement(event, user_id, settlement_id):
+    """
+    POST /user-data/{settlement_id}
+    Expects: settlement data in request body
+    Optional: version query parameter; the save only succeeds if the stored
+              version still matches, otherwise 409 with the current version
+    Returns: Confirmation with user_id and settlement_id, plus the new version
+             when a version was sent
+    """
+    query_parameters = event.get('queryStringParameters') or {}
+    expected_version = query_parameters.get('version')
+    if expected_version is not None:
+        try:
+            expected_version = int(expected_version)
+            valid_version = expected_version >= 0
+        except ValueError:
+            valid_version = False
+
+        if not valid_version:
+            logger.warning("Invalid version | user_id=%s | version=%s", user_id, expected_version)
+            return build_response(400, json.dumps({'error': 'version must be a non-negative integer'}))
+
+    raw_body = event.get('body', '{}')
+    # Bodies arrive base64-encoded when they match the API's binary media types
+    if raw_body and event.get('isBase64Encoded'):
+        raw_body = base64.b64decode(raw_body).decode()
+    # The raw request body is already the JSON payload, so measure it directly
+    data_size = len(raw_body or '')
+    data_size_mb = data_size / (1024 * 1024)
+
+    # Reject payloads larger than 10MB
+    if data_size_mb > MAX_PAYLOAD_SIZE_MB:
+        logger.warning("Payload too large | user_id=%s | size=%.2fMB | max=%dMB", user_id, data_size_mb, MAX_PAYLOAD_SIZE_MB)
+        return build_response(413, json.dumps({
+            'error': f'Payload too large ({data_size_mb:.2f} MB). Maximum allowed size is {MAX_PAYLOAD_SIZE_MB} MB.'
+        }))
+
+    body = json.loads(raw_body)
+
+    # Write data and bump the version in one call; when the client sent the
+    # version it last read, the condition rejects lost updates without a read
+    params = {
+        'TableName': user_data_table,
+        'Key': settlement_key(user_id, settlement_id),
+        'UpdateExpression': 'SET #data = :data, updated_at = :updated_at, '
+                            '#version = if_not_exists(#version, :zero) + :one',
+        'ExpressionAttributeNames': {'#data': 'data', '#version': 'version'},
+        'ExpressionAttributeValues': {
+            ':data': serializer.serialize(body),
+            ':updated_at': {'S': utc_timestamp()},
+            ':zero': {'N': '0'},
+            ':one': {'N': '1'}
+        },
+        # The new version is known up front when the client sent one, so
+        # never read the updated data blob back
+        'ReturnValues': 'NONE'
+    }
+    if expected_version == 0:
+        # Items saved before versioning count as version 0, like new ones
+        params['ConditionExpression'] = 'attribute_not_exists(#version)'
+    elif expected_version is not None:
+        params['ConditionExpression'] = '#version = :expected'
+        params['ExpressionAttributeValues'][':expected'] = {'N': str(expected_version)}
+    if 'ConditionExpression' in params:
+        # Only sent back when the condition fails, to report the current version
+        params['ReturnValuesOnConditionCheckFailure'] = 'ALL_OLD'
+
+    # Evict before writing so a 409 "reload and retry" never reloads a
+    # cached copy older than the one that caused the conflict
+    settlement_cache.pop((user_id, settlement_id), None)
+    try:
+        dynamodb.update_item(**params)
+    except dynamodb.exceptions.ConditionalCheckFailedException as e:
+        current = e.response.get('Item', {}).get('version')
+        current_version = int(current['N']) if current else 0
+        logger.warning("Version conflict | user_id=%s | settlement_id=%s | expected=%d | current=%d", user_id, settlement_id, expected_version, current_version)
+        return build_response(409, json.dumps({
+            'error': 'Settlement was modified by another save; reload and retry',
+            'version': current_version
+        }))
+
+    logger.debug("Saved data | user_id=%s | settlement_id=%s | size=%d bytes", user_id, settlement_id, data_size)
+
+    result = {
+        'message': 'Data saved successfully',
+        'user_id': user_id,
+        'settlement_id': settlement_id
+    }
+    if expected_version is not None:
+        result['version'] = expected_version + 1
+    return build_response(200, json.dumps(result))
+
+def delete_settlement(event, user_id, settlement_id):
+    """
+    DELETE /user-data/{settlement_id}
+    Returns: Confirmation with deleted settlement_id, or 404 if it did not exist
+    """
+    # Delete item from DynamoDB; the condition reports a missing settlement
+    # in the same round trip without sending the old item back
+    settlement_cache.pop((user_id, settlement_id), None)
+    try:
+        dynamodb.delete_item(
+            TableName=user_data_table,
+            Key=settlement_key(user_id, settlement_id),
+            ConditionExpression='attribute_exists(settlement_id)'
+        )
+    except dynamodb.exceptions.ConditionalCheckFailedException:
+        logger.warning("Settlement not found | user_id=%s | settlement_id=%s", user_id, settlement_id)
+        return build_response(404, json.dumps({'error': 'Settlement not found'}))
+
+    return build_response(200, json.dumps({
+        'message': 'Data deleted successfully',
+        'user_id': user_id,
+        'settlement_id': settlement_id
+    }))
+
+# Dispatch on (HTTP method, whether a settlement_id path parameter is present)
+ROUTES = {
+    ('GET', True): get_settlement,
+    ('GET', False): list_settlements,
+    ('POST', True): save_settlement,
+    ('DELETE', True): delete_settlement,
+}
+
+
+def route_request(event, record):
+    """Authenticate the caller and dispatch to the matching route"""
+    try:
+        user_id = extract_user_id(event)
+        path_parameters = event.get('pathParameters') or {}
+        settlement_id = path_parameters.get('settlement_id')
+        method = event.get('httpMethod')
+        record['user_id'] = user_id
+        record['settlement_id'] = settlement_id
+
+        route = ROUTES.get((method, bool(settlement_id)))
+        if route is None:
+            if not settlement_id and (method, True) in ROUTES:
+                logger.warning("Missing settlement_id | user_id=%s", user_id)
+                return build_response(400, json.dumps({'error': 'settlement_id is required'}))
+            logger.warning("Unsupported route | method=%s | path=%s", method, event.get('path'))
+            return build_response(405, json.dumps({'error': 'Method not allowed'}))
+
+        return route(event, user_id, settlement_id)
+
+    except json.JSONDecodeError as e:
+        logger.warning("Invalid JSON | error=%s", e)
+        return build_response(400, json.dumps({'error': 'Invalid JSON in request body'}))
+    except ValueError as e:
+        logger.warning("Validation error | error=%s", e)
+        return build_response(401, json.dumps({'error': str(e)}))
+    except Exception:
+        logger.exception("Unexpected error")
+        return build_response(500, json.dumps({'error': 'Internal server error'}))
+
+
+def lambda_handler(event, context):
+    """
+    Route user settlement data requests
+    All /user-data endpoints share this function so one warm container and
+    its DynamoDB connection pool serve every verb. Each request is logged as
+    a single structured record once the response is ready.
+    """
+    started_ns = time_ns()
+    record = {
+        'type': 'REQUEST',
+        'timestamp': utc_timestamp(),
+        'method': event.get('httpMethod'),
+        'path': event.get('path'),
+        'user_id': None,
+        'settlement_id': None
+    }
+
+    response = route_request(event, record)
+
+    record['status'] = response['statusCode']
+    record['duration_ms'] = round((time_ns() - started_ns) / 1_000_000, 1)
+    logger.info(json.dumps(record))
+    return response
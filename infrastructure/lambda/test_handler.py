@@ -0,0 +1,445 @@
+import base64
+import gzip
+import json
+import os
+from concurrent.futures import Future
+
+import pytest
+from botocore.stub import ANY, Stubber
+
+os.environ.setdefault('USER_DATA_TABLE', 'test-user-data')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import handler  # noqa: E402
+
+TABLE = os.environ['USER_DATA_TABLE']
+USER_ID = 'user-1'
+
+
+class ImmediateExecutor:
+    """Runs submitted work inline so stubbed calls happen in a fixed order"""
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+@pytest.fixture
+def stubber(monkeypatch):
+    handler.settlement_cache.clear()
+    monkeypatch.setattr(handler, 'executor', ImmediateExecutor())
+    with Stubber(handler.dynamodb) as stub:
+        yield stub
+        stub.assert_no_pending_responses()
+
+
+def make_event(method, settlement_id=None, body=None, query=None, headers=None, base64_body=False):
+    return {
+        'httpMethod': method,
+        'path': '/user-data' + (f'/{settlement_id}' if settlement_id else ''),
+        'pathParameters': {'settlement_id': settlement_id} if settlement_id else None,
+        'queryStringParameters': query,
+        'headers': headers or {},
+        'requestContext': {'authorizer': {'claims': {'sub': USER_ID}}},
+        'body': body,
+        'isBase64Encoded': base64_body,
+    }
+
+
+def make_item(settlement_id, data=None, version=1):
+    return {
+        'user_id': {'S': USER_ID},
+        'settlement_id': {'S': settlement_id},
+        'data': {'M': {'name': {'S': data or settlement_id}, 'population': {'N': '12'}}},
+        'updated_at': {'S': '2026-02-11T10:00:00.000000'},
+        'version': {'N': str(version)},
+    }
+
+
+def key_params(settlement_id):
+    return {'TableName': TABLE, 'Key': handler.settlement_key(USER_ID, settlement_id)}
+
+
+def query_params(**extra):
+    params = {
+        'TableName': TABLE,
+        'KeyConditionExpression': 'user_id = :user_id',
+        'ExpressionAttributeValues': {':user_id': {'S': USER_ID}},
+    }
+    params.update(extra)
+    return params
+
+
+def update_params(settlement_id, condition=None, expected=None):
+    values = {':data': ANY, ':updated_at': ANY, ':zero': {'N': '0'}, ':one': {'N': '1'}}
+    params = {
+        'TableName': TABLE,
+        'Key': handler.settlement_key(USER_ID, settlement_id),
+        'UpdateExpression': ANY,
+        'ExpressionAttributeNames': {'#data': 'data', '#version': 'version'},
+        'ExpressionAttributeValues': values,
+        'ReturnValues': 'NONE',
+    }
+    if condition:
+        params['ConditionExpression'] = condition
+        params['ReturnValuesOnConditionCheckFailure'] = 'ALL_OLD'
+    if expected is not None:
+        values[':expected'] = {'N': str(expected)}
+    return params
+
+
+def invoke(event):
+    response = handler.lambda_handler(event, None)
+    return response['statusCode'], response
+
+
+def body_of(response):
+    return json.loads(response['body'])
+
+
+# Routing
+
+def test_get_settlement_returns_item(stubber):
+    stubber.add_response('get_item', {'Item': make_item('s1')}, key_params('s1'))
+
+    status, response = invoke(make_event('GET', 's1'))
+
+    assert status == 200
+    assert body_of(response)['data'] == {'name': 's1', 'population': 12}
+    assert response['headers'] == handler.CORS_HEADERS
+
+
+def test_get_missing_settlement_returns_404(stubber):
+    stubber.add_response('get_item', {}, key_params('missing'))
+
+    status, _ = invoke(make_event('GET', 'missing'))
+
+    assert status == 404
+
+
+def test_list_settlements_walks_every_page(stubber):
+    stubber.add_response('query', {
+        'Items': [make_item('s1')],
+        'LastEvaluatedKey': handler.settlement_key(USER_ID, 's1'),
+    }, query_params())
+    stubber.add_response('query', {'Items': [make_item('s2')]}, query_params(
+        ExclusiveStartKey=handler.settlement_key(USER_ID, 's1')))
+
+    status, response = invoke(make_event('GET'))
+
+    assert status == 200
+    assert [item['settlement_id'] for item in body_of(response)] == ['s1', 's2']
+
+
+def test_save_settlement_returns_confirmation(stubber):
+    stubber.add_response('update_item', {}, update_params('s1'))
+
+    status, response = invoke(make_event('POST', 's1', body=json.dumps({'name': 'Lantern Hoard'})))
+
+    assert status == 200
+    assert body_of(response) == {'message': 'Data saved successfully', 'user_id': USER_ID, 'settlement_id': 's1'}
+
+
+@pytest.mark.parametrize('method', ['POST', 'DELETE'])
+def test_write_without_settlement_id_returns_400(stubber, method):
+    status, response = invoke(make_event(method, body='{}'))
+
+    assert status == 400
+    assert body_of(response) == {'error': 'settlement_id is required'}
+
+
+@pytest.mark.parametrize('method,settlement_id', [('PUT', 's1'), ('PATCH', None)])
+def test_unsupported_route_returns_405(stubber, method, settlement_id):
+    status, _ = invoke(make_event(method, settlement_id))
+
+    assert status == 405
+
+
+def test_missing_authorization_returns_401(stubber):
+    event = make_event('GET', 's1')
+    event['requestContext'] = {}
+
+    status, _ = invoke(event)
+
+    assert status == 401
+
+
+def test_invalid_json_returns_400(stubber):
+    status, response = invoke(make_event('POST', 's1', body='{not json'))
+
+    assert status == 400
+    assert body_of(response) == {'error': 'Invalid JSON in request body'}
+
+
+# Deletes
+
+def delete_params(settlement_id):
+    return {**key_params(settlement_id), 'ConditionExpression': 'attribute_exists(settlement_id)'}
+
+
+def test_delete_returns_confirmation(stubber):
+    stubber.add_response('delete_item', {}, delete_params('s1'))
+
+    status, response = invoke(make_event('DELETE', 's1'))
+
+    assert status == 200
+    assert body_of(response)['settlement_id'] == 's1'
+
+
+def test_delete_missing_settlement_returns_404(stubber):
+    stubber.add_client_error('delete_item', service_error_code='ConditionalCheckFailedException',
+                             http_status_code=400, expected_params=delete_params('missing'))
+
+    status, _ = invoke(make_event('DELETE', 'missing'))
+
+    assert status == 404
+
+
+# Pagination
+
+def test_cursor_round_trip(stubber):
+    last_key = handler.settlement_key(USER_ID, 's2')
+    stubber.add_response('query', {'Items': [make_item('s1'), make_item('s2')], 'LastEvaluatedKey': last_key},
+                         query_params(Limit=2))
+    stubber.add_response('query', {'Items': [make_item('s3')]}, query_params(Limit=2, ExclusiveStartKey=last_key))
+
+    _, first = invoke(make_event('GET', query={'limit': '2'}))
+    first_page = body_of(first)
+    _, second = invoke(make_event('GET', query={'limit': '2', 'cursor': first_page['next']}))
+    second_page = body_of(second)
+
+    assert [item['settlement_id'] for item in first_page['items']] == ['s1', 's2']
+    assert [item['settlement_id'] for item in second_page['items']] == ['s3']
+    assert second_page['next'] is None
+
+
+def test_cursor_only_carries_settlement_id():
+    cursor = handler.encode_cursor(handler.settlement_key('someone-else', 's9'))
+
+    assert handler.decode_cursor(cursor, USER_ID) == handler.settlement_key(USER_ID, 's9')
+
+
+@pytest.mark.parametrize('query', [
+    {'limit': '0'},
+    {'limit': str(handler.MAX_PAGE_SIZE + 1)},
+    {'limit': 'abc'},
+    {'cursor': '!!'},
+])
+def test_invalid_page_parameters_return_400(stubber, query):
+    status, _ = invoke(make_event('GET', query=query))
+
+    assert status == 400
+
+
+# Summaries
+
+def test_list_settlements_summary_uses_projection(stubber):
+    stubber.add_response('query', {'Items': [{'settlement_id': {'S': 's1'}, 'updated_at': {'S': '2026-02-11'}}]},
+                         query_params(ProjectionExpression=handler.SUMMARY_PROJECTION))
+
+    status, response = invoke(make_event('GET', query={'summary': 'true'}))
+
+    assert status == 200
+    assert body_of(response) == [{'settlement_id': 's1', 'updated_at': '2026-02-11'}]
+
+
+# Payload size
+
+def test_save_rejects_oversized_payload(stubber):
+    oversized = json.dumps({'blob': 'x' * (handler.MAX_PAYLOAD_SIZE_MB * 1024 * 1024)})
+
+    status, _ = invoke(make_event('POST', 's1', body=oversized))
+
+    assert status == 413
+
+
+# Versioned saves
+
+def test_save_with_version_returns_next_version(stubber):
+    stubber.add_response('update_item', {}, update_params('s1', '#version = :expected', expected=3))
+
+    status, response = invoke(make_event('POST', 's1', body='{}', query={'version': '3'}))
+
+    assert status == 200
+    assert body_of(response)['version'] == 4
+
+
+def test_save_with_version_zero_requires_unversioned_item(stubber):
+    stubber.add_response('update_item', {}, update_params('s1', 'attribute_not_exists(#version)'))
+
+    status, response = invoke(make_event('POST', 's1', body='{}', query={'version': '0'}))
+
+    assert status == 200
+    assert body_of(response)['version'] == 1
+
+
+def test_save_version_conflict_returns_409(stubber):
+    stubber.add_client_error('update_item', service_error_code='ConditionalCheckFailedException',
+                             http_status_code=400, expected_params=update_params('s1', '#version = :expected', expected=2))
+
+    status, _ = invoke(make_event('POST', 's1', body='{}', query={'version': '2'}))
+
+    assert status == 409
+
+
+@pytest.mark.parametrize('version', ['latest', '1.5', '-3'])
+def test_save_invalid_version_returns_400(stubber, version):
+    status, response = invoke(make_event('POST', 's1', body='{}', query={'version': version}))
+
+    assert status == 400
+    assert body_of(response) == {'error': 'version must be a non-negative integer'}
+
+
+# Caching
+
+def test_get_is_cached_until_save(stubber):
+    stubber.add_response('get_item', {'Item': make_item('s1', data='before')}, key_params('s1'))
+    stubber.add_response('update_item', {}, update_params('s1'))
+    stubber.add_response('get_item', {'Item': make_item('s1', data='after')}, key_params('s1'))
+
+    _, first = invoke(make_event('GET', 's1'))
+    _, cached = invoke(make_event('GET', 's1'))
+    invoke(make_event('POST', 's1', body='{}'))
+    _, refreshed = invoke(make_event('GET', 's1'))
+
+    assert body_of(first)['data']['name'] == 'before'
+    assert body_of(cached)['data']['name'] == 'before'
+    assert body_of(refreshed)['data']['name'] == 'after'
+
+
+def test_version_conflict_evicts_cache_and_reports_current_version(stubber):
+    stubber.add_response('get_item', {'Item': make_item('s1', version=1)}, key_params('s1'))
+    stubber.add_client_error('update_item', service_error_code='ConditionalCheckFailedException',
+                             http_status_code=400, expected_params=update_params('s1', '#version = :expected', expected=1),
+                             modeled_fields={'Item': make_item('s1', version=2)})
+    stubber.add_response('get_item', {'Item': make_item('s1', version=2)}, key_params('s1'))
+
+    invoke(make_event('GET', 's1'))
+    conflict_status, conflict = invoke(make_event('POST', 's1', body='{}', query={'version': '1'}))
+    _, reloaded = invoke(make_event('GET', 's1'))
+
+    assert conflict_status == 409
+    assert body_of(conflict)['version'] == 2
+    assert body_of(reloaded)['version'] == 2
+
+
+def test_delete_evicts_cached_settlement(stubber):
+    stubber.add_response('get_item', {'Item': make_item('s1')}, key_params('s1'))
+    stubber.add_response('delete_item', {}, delete_params('s1'))
+    stubber.add_response('get_item', {}, key_params('s1'))
+
+    invoke(make_event('GET', 's1'))
+    invoke(make_event('DELETE', 's1'))
+    status, _ = invoke(make_event('GET', 's1'))
+
+    assert status == 404
+
+
+def test_missing_settlement_is_not_cached(stubber):
+    stubber.add_response('get_item', {}, key_params('s1'))
+    stubber.add_response('get_item', {'Item': make_item('s1')}, key_params('s1'))
+
+    missing_status, _ = invoke(make_event('GET', 's1'))
+    found_status, _ = invoke(make_event('GET', 's1'))
+
+    assert (missing_status, found_status) == (404, 200)
+
+
+def test_cache_evicts_oldest_entry_when_full(stubber, monkeypatch):
+    monkeypatch.setattr(handler, 'SETTLEMENT_CACHE_SIZE', 2)
+    for settlement_id in ('s1', 's2', 's3'):
+        stubber.add_response('get_item', {'Item': make_item(settlement_id)}, key_params(settlement_id))
+        invoke(make_event('GET', settlement_id))
+
+    assert list(handler.settlement_cache) == [(USER_ID, 's2'), (USER_ID, 's3')]
+
+
+# Combined item and summaries
+
+def test_include_summaries_returns_item_and_listing(stubber):
+    stubber.add_response('query', {'Items': [{'settlement_id': {'S': 's1'}, 'updated_at': {'S': '2026-02-11'}}]},
+                         query_params(ProjectionExpression=handler.SUMMARY_PROJECTION))
+    stubber.add_response('get_item', {'Item': make_item('s1')}, key_params('s1'))
+
+    status, response = invoke(make_event('GET', 's1', query={'include': 'summaries'}))
+
+    assert status == 200
+    assert body_of(response)['item']['settlement_id'] == 's1'
+    assert body_of(response)['settlements'] == [{'settlement_id': 's1', 'updated_at': '2026-02-11'}]
+
+
+def test_include_summaries_missing_item_returns_404(stubber):
+    stubber.add_response('query', {'Items': []}, query_params(ProjectionExpression=handler.SUMMARY_PROJECTION))
+    stubber.add_response('get_item', {}, key_params('missing'))
+
+    status, _ = invoke(make_event('GET', 'missing', query={'include': 'summaries'}))
+
+    assert status == 404
+
+
+def test_include_summaries_query_error_is_not_lost_on_404(stubber):
+    stubber.add_client_error('query', service_error_code='InternalServerError', http_status_code=500,
+                             expected_params=query_params(ProjectionExpression=handler.SUMMARY_PROJECTION))
+    stubber.add_response('get_item', {}, key_params('missing'))
+
+    status, _ = invoke(make_event('GET', 'missing', query={'include': 'summaries'}))
+
+    assert status == 500
+
+
+# Compression and binary bodies
+
+def test_large_list_is_gzipped_when_accepted(stubber):
+    items = [make_item(f's{i}', data='x' * 100) for i in range(20)]
+    stubber.add_response('query', {'Items': items}, query_params())
+
+    status, response = invoke(make_event('GET', headers={'accept-encoding': 'gzip, deflate, br'}))
+
+    assert status == 200
+    assert response['isBase64Encoded'] is True
+    assert response['headers']['Content-Encoding'] == 'gzip'
+    listing = json.loads(gzip.decompress(base64.b64decode(response['body'])))
+    assert len(listing) == 20
+
+
+def test_large_page_is_gzipped_when_accepted(stubber):
+    items = [make_item(f's{i}', data='x' * 100) for i in range(20)]
+    stubber.add_response('query', {'Items': items}, query_params(Limit=20))
+
+    _, response = invoke(make_event('GET', query={'limit': '20'}, headers={'Accept-Encoding': 'gzip'}))
+
+    page = json.loads(gzip.decompress(base64.b64decode(response['body'])))
+    assert len(page['items']) == 20
+
+
+def test_list_is_not_gzipped_without_accept_encoding(stubber):
+    items = [make_item(f's{i}', data='x' * 100) for i in range(20)]
+    stubber.add_response('query', {'Items': items}, query_params())
+
+    _, response = invoke(make_event('GET'))
+
+    assert 'isBase64Encoded' not in response
+    assert len(body_of(response)) == 20
+
+
+def test_small_list_is_not_gzipped(stubber):
+    stubber.add_response('query', {'Items': [make_item('s1')]}, query_params())
+
+    _, response = invoke(make_event('GET', headers={'Accept-Encoding': 'gzip'}))
+
+    assert 'isBase64Encoded' not in response
+
+
+def test_save_decodes_base64_body(stubber):
+    params = update_params('s1')
+    params['ExpressionAttributeValues'][':data'] = {'M': {'name': {'S': 'White Lion'}}}
+    stubber.add_response('update_item', {}, params)
+    encoded = base64.b64encode(json.dumps({'name': 'White Lion'}).encode()).decode()
+
+    status, _ = invoke(make_event('POST', 's1', body=encoded, base64_body=True))
+
+    assert status == 200
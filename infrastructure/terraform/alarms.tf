@@ -83,9 +83,9 @@ resource "aws_cloudwatch_metric_alarm" "api_high_5xx_errors" {
   }
 }
 
-# Alarm: Lambda High Error Rate (get_user_data)
-resource "aws_cloudwatch_metric_alarm" "lambda_get_errors" {
-  alarm_name          = "${var.app_name}-${var.environment}-lambda-get-errors"
+# Alarm: Lambda High Error Rate (user data API)
+resource "aws_cloudwatch_metric_alarm" "lambda_errors" {
+  alarm_name          = "${var.app_name}-${var.environment}-lambda-errors"
   comparison_operator = "GreaterThanThreshold"
   evaluation_periods  = 2
   metric_name         = "Errors"
@@ -93,59 +93,15 @@ resource "aws_cloudwatch_metric_alarm" "lambda_get_errors" {
   period              = 300
   statistic           = "Sum"
   threshold           = 5
-  alarm_description   = "Alert when get_user_data Lambda has high error count"
+  alarm_description   = "Alert when the user data Lambda has high error count"
   alarm_actions       = local.alarm_actions
 
   dimensions = {
-    FunctionName = aws_lambda_function.get_user_data.function_name
+    FunctionName = aws_lambda_function.user_data.function_name
   }
 
   tags = {
-    Name = "${var.app_name}-lambda-get-errors"
-  }
-}
-
-# Alarm: Lambda High Error Rate (save_user_data)
-resource "aws_cloudwatch_metric_alarm" "lambda_save_errors" {
-  alarm_name          = "${var.app_name}-${var.environment}-lambda-save-errors"
-  comparison_operator = "GreaterThanThreshold"
-  evaluation_periods  = 2
-  metric_name         = "Errors"
-  namespace           = "AWS/Lambda"
-  period              = 300
-  statistic           = "Sum"
-  threshold           = 5
-  alarm_description   = "Alert when save_user_data Lambda has high error count"
-  alarm_actions       = local.alarm_actions
-
-  dimensions = {
-    FunctionName = aws_lambda_function.save_user_data.function_name
-  }
-
-  tags = {
-    Name = "${var.app_name}-lambda-save-errors"
-  }
-}
-
-# Alarm: Lambda High Error Rate (delete_user_data)
-resource "aws_cloudwatch_metric_alarm" "lambda_delete_errors" {
-  alarm_name          = "${var.app_name}-${var.environment}-lambda-delete-errors"
-  comparison_operator = "GreaterThanThreshold"
-  evaluation_periods  = 2
-  metric_name         = "Errors"
-  namespace           = "AWS/Lambda"
-  period              = 300
-  statistic           = "Sum"
-  threshold           = 5
-  alarm_description   = "Alert when delete_user_data Lambda has high error count"
-  alarm_actions       = local.alarm_actions
-
-  dimensions = {
-    FunctionName = aws_lambda_function.delete_user_data.function_name
-  }
-
-  tags = {
-    Name = "${var.app_name}-lambda-delete-errors"
+    Name = "${var.app_name}-lambda-errors"
   }
 }
 
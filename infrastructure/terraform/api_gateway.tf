@@ -3,6 +3,9 @@ resource "aws_api_gateway_rest_api" "main" {
   name        = "${var.app_name}-api-${var.environment}"
   description = "KDM Settlement Manager API"
 
+  # Lets the Lambda return gzipped list responses as base64 bodies
+  binary_media_types = ["*/*"]
+
   endpoint_configuration {
     types = ["REGIONAL"]
   }
@@ -48,7 +51,7 @@ resource "aws_api_gateway_integration" "get_all_user_data" {
   http_method             = aws_api_gateway_method.get_all_user_data.http_method
   type                    = "AWS_PROXY"
   integration_http_method = "POST"
-  uri                     = aws_lambda_function.get_user_data.invoke_arn
+  uri                     = aws_lambda_function.user_data.invoke_arn
 }
 
 resource "aws_api_gateway_method_response" "get_all_user_data_200" {
@@ -97,6 +100,8 @@ resource "aws_api_gateway_integration" "cors_user_data" {
   resource_id = aws_api_gateway_resource.user_data.id
   http_method = aws_api_gateway_method.cors_user_data.http_method
   type        = "MOCK"
+  # Keep the mock request template text-based despite the */* binary media type
+  content_handling = "CONVERT_TO_TEXT"
   request_templates = {
     "application/json" = "{\"statusCode\": 200}"
   }
@@ -158,7 +163,7 @@ resource "aws_api_gateway_integration" "get_user_data" {
   http_method             = aws_api_gateway_method.get_user_data.http_method
   type                    = "AWS_PROXY"
   integration_http_method = "POST"
-  uri                     = aws_lambda_function.get_user_data.invoke_arn
+  uri                     = aws_lambda_function.user_data.invoke_arn
 }
 
 resource "aws_api_gateway_method_response" "get_user_data_400" {
@@ -201,7 +206,7 @@ resource "aws_api_gateway_integration" "save_user_data" {
   http_method             = aws_api_gateway_method.save_user_data.http_method
   type                    = "AWS_PROXY"
   integration_http_method = "POST"
-  uri                     = aws_lambda_function.save_user_data.invoke_arn
+  uri                     = aws_lambda_function.user_data.invoke_arn
 }
 
 resource "aws_api_gateway_method_response" "save_user_data_400" {
@@ -244,7 +249,7 @@ resource "aws_api_gateway_integration" "delete_user_data" {
   http_method             = aws_api_gateway_method.delete_user_data.http_method
   type                    = "AWS_PROXY"
   integration_http_method = "POST"
-  uri                     = aws_lambda_function.delete_user_data.invoke_arn
+  uri                     = aws_lambda_function.user_data.invoke_arn
 }
 
 resource "aws_api_gateway_method_response" "delete_user_data_400" {
@@ -282,6 +287,8 @@ resource "aws_api_gateway_integration" "cors_settlement" {
   resource_id = aws_api_gateway_resource.user_data_settlement.id
   http_method = aws_api_gateway_method.cors_settlement.http_method
   type        = "MOCK"
+  # Keep the mock request template text-based despite the */* binary media type
+  content_handling = "CONVERT_TO_TEXT"
   request_templates = {
     "application/json" = "{\"statusCode\": 200}"
   }
@@ -483,26 +490,11 @@ resource "aws_api_gateway_gateway_response" "missing_authentication_token" {
   }
 }
 
-resource "aws_lambda_permission" "api_gateway_get" {
-  statement_id  = "AllowAPIGatewayInvoke"
-  action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.get_user_data.function_name
-  principal     = "apigateway.amazonaws.com"
-  source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
-}
-
-resource "aws_lambda_permission" "api_gateway_save" {
-  statement_id  = "AllowAPIGatewayInvoke"
-  action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.save_user_data.function_name
-  principal     = "apigateway.amazonaws.com"
-  source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
-}
-
-resource "aws_lambda_permission" "api_gateway_delete" {
+# All /user-data routes invoke the same function
+resource "aws_lambda_permission" "api_gateway" {
   statement_id  = "AllowAPIGatewayInvoke"
   action        = "lambda:InvokeFunction"
-  function_name = aws_lambda_function.delete_user_data.function_name
+  function_name = aws_lambda_function.user_data.function_name
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
 }
@@ -524,6 +516,7 @@ resource "aws_api_gateway_deployment" "main" {
 
   triggers = {
     redeployment = sha1(jsonencode([
+      aws_api_gateway_rest_api.main.binary_media_types,
       aws_api_gateway_resource.user_data.id,
       aws_api_gateway_resource.user_data_settlement.id,
       aws_api_gateway_method.get_all_user_data.id,
@@ -538,6 +531,13 @@ resource "aws_api_gateway_deployment" "main" {
       aws_api_gateway_integration.delete_user_data.id,
       aws_api_gateway_integration.cors_user_data.id,
       aws_api_gateway_integration.cors_settlement.id,
+      # Integration URIs and content handling update in place without changing ids
+      aws_api_gateway_integration.get_all_user_data.uri,
+      aws_api_gateway_integration.get_user_data.uri,
+      aws_api_gateway_integration.save_user_data.uri,
+      aws_api_gateway_integration.delete_user_data.uri,
+      aws_api_gateway_integration.cors_user_data.content_handling,
+      aws_api_gateway_integration.cors_settlement.content_handling,
     ]))
   }
 
@@ -101,9 +101,7 @@ resource "aws_iam_role_policy" "api_gateway_lambda_invoke" {
           "lambda:InvokeFunction"
         ]
         Resource = [
-          aws_lambda_function.get_user_data.arn,
-          aws_lambda_function.save_user_data.arn,
-          aws_lambda_function.delete_user_data.arn
+          aws_lambda_function.user_data.arn
         ]
       }
     ]
@@ -78,60 +78,23 @@ resource "aws_cloudwatch_dashboard" "main" {
         }
       },
 
-      # Row 2: Individual Lambda Functions
+      # Row 2: User Data API Lambda Function
       {
         type   = "metric"
-        width  = 8
+        width  = 24
         height = 6
         x      = 0
         y      = 6
         properties = {
           metrics = [
-            ["AWS/Lambda", "Invocations", { stat = "Sum", label = "Invocations" }],
-            [".", "Errors", { stat = "Sum", label = "Errors", color = "#d62728" }],
-            [".", "Duration", { stat = "Average", label = "Duration (ms)", yAxis = "right" }],
-          ]
-          period = 300
-          stat   = "Average"
-          region = var.aws_region
-          title  = "get_user_data Function"
-          yAxis = {
-            left = {
-              min = 0
-            }
-            right = {
-              min = 0
-            }
-          }
-          view = "timeSeries"
-          annotations = {
-            horizontal = [
-              {
-                label = "Timeout Threshold"
-                value = var.lambda_timeout * 1000 * 0.8
-                fill  = "above"
-                color = "#d62728"
-              }
-            ]
-          }
-        }
-      },
-      {
-        type   = "metric"
-        width  = 8
-        height = 6
-        x      = 8
-        y      = 6
-        properties = {
-          metrics = [
-            ["AWS/Lambda", "Invocations", { stat = "Sum", label = "Invocations", dimensions = { FunctionName = aws_lambda_function.save_user_data.function_name } }],
-            [".", "Errors", { stat = "Sum", label = "Errors", color = "#d62728", dimensions = { FunctionName = aws_lambda_function.save_user_data.function_name } }],
-            [".", "Duration", { stat = "Average", label = "Duration (ms)", yAxis = "right", dimensions = { FunctionName = aws_lambda_function.save_user_data.function_name } }],
+            ["AWS/Lambda", "Invocations", { stat = "Sum", label = "Invocations", dimensions = { FunctionName = aws_lambda_function.user_data.function_name } }],
+            [".", "Errors", { stat = "Sum", label = "Errors", color = "#d62728", dimensions = { FunctionName = aws_lambda_function.user_data.function_name } }],
+            [".", "Duration", { stat = "Average", label = "Duration (ms)", yAxis = "right", dimensions = { FunctionName = aws_lambda_function.user_data.function_name } }],
           ]
           period = 300
           stat   = "Average"
           region = var.aws_region
-          title  = "save_user_data Function"
+          title  = "user_data Function"
           yAxis = {
             left = {
               min = 0
@@ -153,33 +116,6 @@ resource "aws_cloudwatch_dashboard" "main" {
           }
         }
       },
-      {
-        type   = "metric"
-        width  = 8
-        height = 6
-        x      = 16
-        y      = 6
-        properties = {
-          metrics = [
-            ["AWS/Lambda", "Invocations", { stat = "Sum", label = "Invocations", dimensions = { FunctionName = aws_lambda_function.delete_user_data.function_name } }],
-            [".", "Errors", { stat = "Sum", label = "Errors", color = "#d62728", dimensions = { FunctionName = aws_lambda_function.delete_user_data.function_name } }],
-            [".", "Duration", { stat = "Average", label = "Duration (ms)", yAxis = "right", dimensions = { FunctionName = aws_lambda_function.delete_user_data.function_name } }],
-          ]
-          period = 300
-          stat   = "Average"
-          region = var.aws_region
-          title  = "delete_user_data Function"
-          yAxis = {
-            left = {
-              min = 0
-            }
-            right = {
-              min = 0
-            }
-          }
-          view = "timeSeries"
-        }
-      },
 
       # Row 3: DynamoDB Performance
       {
@@ -384,9 +320,7 @@ resource "aws_cloudwatch_dashboard" "main" {
         y      = 36
         properties = {
           metrics = [
-            ["AWS/Lambda", "ConcurrentExecutions", { stat = "Maximum", label = "get_user_data", dimensions = { FunctionName = aws_lambda_function.get_user_data.function_name } }],
-            ["...", { dimensions = { FunctionName = aws_lambda_function.save_user_data.function_name }, label = "save_user_data" }],
-            ["...", { dimensions = { FunctionName = aws_lambda_function.delete_user_data.function_name }, label = "delete_user_data" }],
+            ["AWS/Lambda", "ConcurrentExecutions", { stat = "Maximum", label = "user_data", dimensions = { FunctionName = aws_lambda_function.user_data.function_name } }],
           ]
           period = 60
           stat   = "Maximum"
@@ -44,13 +44,9 @@ output "api_gateway_invoke_url" {
   value       = aws_api_gateway_stage.main.invoke_url
 }
 
-output "lambda_function_names" {
-  description = "Lambda function names"
-  value = {
-    get_user_data    = aws_lambda_function.get_user_data.function_name
-    save_user_data   = aws_lambda_function.save_user_data.function_name
-    delete_user_data = aws_lambda_function.delete_user_data.function_name
-  }
+output "lambda_function_name" {
+  description = "Name of the Lambda function serving the user data API"
+  value       = aws_lambda_function.user_data.function_name
 }
 
 output "backup_vault_name" {
@@ -68,9 +68,9 @@ variable "lambda_timeout" {
 }
 
 variable "lambda_memory" {
-  description = "Lambda function memory in MB"
+  description = "Lambda function memory in MB (CPU scales with memory up to one vCPU at 1769 MB; see README for Power Tuning)"
   type        = number
-  default     = 256
+  default     = 1024
 
   validation {
     condition     = var.lambda_memory >= 128 && var.lambda_memory <= 10240
@@ -78,6 +78,23 @@ variable "lambda_memory" {
   }
 }
 
+variable "lambda_architecture" {
+  description = "Lambda instruction set architecture (arm64 runs on Graviton at lower cost per GB-second)"
+  type        = string
+  default     = "arm64"
+
+  validation {
+    condition     = contains(["arm64", "x86_64"], var.lambda_architecture)
+    error_message = "Lambda architecture must be arm64 or x86_64."
+  }
+}
+
+variable "lambda_layers" {
+  description = "Lambda layer ARNs attached to the API function (e.g. a layer providing orjson for faster JSON responses)"
+  type        = list(string)
+  default     = []
+}
+
 variable "dynamodb_billing_mode" {
   description = "DynamoDB billing mode (PROVISIONED or PAY_PER_REQUEST)"
   type        = string